@@ -1,11 +1,14 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
+from numba import njit
+import calendar
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
-import gspread
 from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
 
 # Page config
 st.set_page_config(
@@ -16,8 +19,12 @@ st.set_page_config(
 
 # Authentication setup
 @st.cache_resource
-def init_gspread():
-    """Initialize Google Sheets connection using service account"""
+def init_services():
+    """Build Google Sheets and Drive API clients from the service account.
+
+    googleapiclient reuses the underlying HTTP connection across calls,
+    so we pay the TLS handshake once per session instead of per request.
+    """
     try:
         credentials_dict = {
             "type": st.secrets["gcp_service_account"]["type"],
@@ -36,162 +43,309 @@ def init_gspread():
         ]
         
         credentials = Credentials.from_service_account_info(credentials_dict, scopes=scopes)
-        return gspread.authorize(credentials)
+        sheets = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
+        drive = build('drive', 'v3', credentials=credentials, cache_discovery=False)
+        return sheets, drive
     except Exception as e:
         st.error(f"Authentication failed: {str(e)}")
-        return None
+        return None, None
 
 # Location and date configurations
 LOCATIONS = {
     "Oxford East": {
         "sheet_name": "Oxford East Monthly Tracker",
-        "years": [2025],
+        "years": (2025,),
         "months": {
-            2025: ["May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25"]
+            2025: ("May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25")
         }
     },
     "Milton Keynes": {
         "sheet_name": "Milton Keynes Monthly Tracker", 
-        "years": [2025],
+        "years": (2025,),
         "months": {
-            2025: ["May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25"]
+            2025: ("May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25")
         }
     },
     "Berkhamsted": {
         "sheet_name": "Berkhamsted Monthly Revenue Tracker",
-        "years": [2025], 
+        "years": (2025,), 
         "months": {
-            2025: ["May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25"]
+            2025: ("May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25")
         }
     },
     "Basingstoke": {
         "sheet_name": "Basingstoke Monthly Tracker",
-        "years": [2025],
+        "years": (2025,),
         "months": {
-            2025: ["May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25"]
+            2025: ("May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25")
         }
     },
     "Aylesbury": {
         "sheet_name": "Aylesbury Monthly Tracker",
-        "years": [2023, 2024, 2025],
+        "years": (2023, 2024, 2025),
         "months": {
-            2023: ["Feb 23", "Mar 23", "Apr 23", "May 23", "Jun 23", "Jul 23", "Aug 23", "Sep 23", "Oct 23", "Nov 23", "Dec 23"],
-            2024: ["Jan 24", "Feb 24", "Mar 24", "Apr 24", "May 24", "Jun 24", "Jul 24", "Aug 24", "Sep 24", "Oct 24", "Nov 24", "Dec 24"],
-            2025: ["Jan 25", "Feb 25", "Mar 25", "Apr 25", "May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25"]
+            2023: ("Feb 23", "Mar 23", "Apr 23", "May 23", "Jun 23", "Jul 23", "Aug 23", "Sep 23", "Oct 23", "Nov 23", "Dec 23"),
+            2024: ("Jan 24", "Feb 24", "Mar 24", "Apr 24", "May 24", "Jun 24", "Jul 24", "Aug 24", "Sep 24", "Oct 24", "Nov 24", "Dec 24"),
+            2025: ("Jan 25", "Feb 25", "Mar 25", "Apr 25", "May 25", "Jun 25", "Jul 25", "Aug 25", "Sep 25", "Oct 25", "Nov 25", "Dec 25")
         }
     }
 }
 
-def load_sheet_data(gc, location, year, month):
-    """Load data from specific Google Sheet tab"""
+# Precomputed once - the sidebar shouldn't rebuild this list every rerun
+LOCATION_KEYS = tuple(LOCATIONS.keys())
+
+# Pinned spreadsheet IDs - locations listed here skip the one-time Drive
+# search by name entirely. Fill in as IDs become known.
+SHEET_IDS = {}
+
+@st.cache_data(show_spinner=False)
+def _parse_df(all_values, location, year, month):
+    """Turn one month's raw cell values into a cleaned DataFrame.
+
+    Takes a tuple-of-tuples so the raw snapshot is hashable; the numeric
+    and datetime coercions only re-run when the cell values change.
+    """
+    if len(all_values) < 2:
+        return pd.DataFrame()
+
+    # Build the DataFrame straight from the 2-D value list - no
+    # per-row dict construction
+    rows = [list(r[:4]) + [''] * (4 - len(r)) for r in all_values[1:]]
+    df = pd.DataFrame(rows, columns=['DateTime', 'Product', 'Quantity', 'Amount'])
+
+    # Arrow-backed strings keep the filter and coercions below off the
+    # object-dtype path
+    df = df.convert_dtypes(dtype_backend='pyarrow')
+
+    # Keep only rows whose first cell looks like a date
+    df = df[df['DateTime'].str.contains('/', regex=False)]
+
+    if df.empty:
+        return pd.DataFrame()
+
+    # Quantity is never read downstream - drop it before it hits memory
+    # and the pickle-based cache
+    df = df[['DateTime', 'Product', 'Amount']]
+
+    # Convert Amount to numeric - float32 is plenty for two-decimal GBP
+    # values and halves the bytes every aggregation touches. Cast before
+    # fillna: on the Arrow-backed column coerced cells become NaN rather
+    # than Arrow NA, and Arrow fillna only fills NA.
+    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce', downcast='float').astype('float32').fillna(0)
+
+    # Parse datetime - handle multiple formats
+    original_dates = df['DateTime'].copy()
+    df['DateTime'] = pd.to_datetime(df['DateTime'], format='%d/%m/%Y %H:%M:%S', errors='coerce', cache=True)
+
+    # Try alternative format for dates without seconds
+    mask = df['DateTime'].isna()
+    if mask.any():
+        df.loc[mask, 'DateTime'] = pd.to_datetime(original_dates[mask], format='%d/%m/%Y %H:%M', errors='coerce', cache=True)
+
+    # Final fallback - let pandas figure it out
+    mask = df['DateTime'].isna()
+    if mask.any():
+        df.loc[mask, 'DateTime'] = pd.to_datetime(original_dates[mask], errors='coerce')
+
+    df = df.dropna(subset=['DateTime'])
+
+    # Sort chronologically once here - POS exports are already nearly
+    # ordered, so the stable sort is cheap, and viewers can reverse for
+    # free instead of re-sorting every rerun
+    df = df.sort_values('DateTime', kind='stable').reset_index(drop=True)
+
+    # Add metadata
+    df['Location'] = location
+    df['Year'] = year
+    df['Month'] = month
+
+    # Categoricals keep downstream groupbys on integer codes instead of
+    # hashing Python strings per row
+    df['Product'] = df['Product'].astype('category')
+    df['Location'] = df['Location'].astype('category')
+
+    return df
+
+@st.cache_resource
+def get_spreadsheet_id(location):
+    """Resolve a location's spreadsheet ID, preferring pinned IDs over Drive"""
+    if location in SHEET_IDS:
+        return SHEET_IDS[location]
+
+    _, drive = init_services()
+    sheet_name = LOCATIONS[location]["sheet_name"]
+    result = drive.files().list(
+        q=f"name = '{sheet_name}' and mimeType = 'application/vnd.google-apps.spreadsheet'",
+        fields='files(id)',
+        pageSize=1
+    ).execute()
+    files = result.get('files', [])
+    if not files:
+        raise FileNotFoundError(f"No spreadsheet named '{sheet_name}'")
+    return files[0]['id']
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_location(location):
+    """Fetch every month tab for a location in one batchGet call.
+
+    Returns a dict of month name -> DataFrame. Cached per location so
+    changing the month selector is a local dict lookup, not an API call.
+    """
     try:
-        sheet_name = LOCATIONS[location]["sheet_name"]
-        sheet = gc.open(sheet_name)
-        worksheet = sheet.worksheet(month)
-        
-        # Get all raw values
-        all_values = worksheet.get_all_values()
-        
-        if len(all_values) < 2:
-            return pd.DataFrame()
-        
-        # Process data rows
-        data_rows = []
-        for row in all_values:
-            if len(row) >= 4 and row[0] and '/' in str(row[0]):  # Has date
-                data_rows.append({
-                    'DateTime': row[0],
-                    'Product': row[1],
-                    'Quantity': row[2], 
-                    'Amount': row[3]
-                })
-        
-        if not data_rows:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(data_rows)
-        
-        # Convert Amount to numeric
-        df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0)
-        
-        # Parse datetime - handle multiple formats
-        original_dates = df['DateTime'].copy()
-        df['DateTime'] = pd.to_datetime(df['DateTime'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
-        
-        # Try alternative format for dates without seconds
-        mask = df['DateTime'].isna()
-        if mask.any():
-            df.loc[mask, 'DateTime'] = pd.to_datetime(original_dates[mask], format='%d/%m/%Y %H:%M', errors='coerce')
-        
-        # Final fallback - let pandas figure it out
-        mask = df['DateTime'].isna()
-        if mask.any():
-            df.loc[mask, 'DateTime'] = pd.to_datetime(original_dates[mask], errors='coerce')
-        
-        df = df.dropna(subset=['DateTime'])
-        
-        # Add metadata
-        df['Location'] = location
-        df['Year'] = year  
-        df['Month'] = month
-        
-        return df
-        
+        config = LOCATIONS[location]
+        spreadsheet_id = get_spreadsheet_id(location)
+
+        # One (year, month) pair per tab, across all configured years
+        tabs = [(year, month) for year in config["years"] for month in config["months"][year]]
+
+        sheets, _ = init_services()
+
+        # batchGet 400s the whole request if any range names a missing
+        # tab, so only ask for configured months that actually exist
+        metadata = sheets.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets.properties.title'
+        ).execute()
+        existing_tabs = {s['properties']['title'] for s in metadata.get('sheets', [])}
+        tabs = [(year, month) for year, month in tabs if month in existing_tabs]
+
+        if not tabs:
+            return {}
+
+        result = sheets.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=[f"'{month}'!A:D" for _, month in tabs]
+        ).execute()
+
+        frames = {}
+        for (year, month), value_range in zip(tabs, result.get('valueRanges', [])):
+            raw = tuple(tuple(r) for r in value_range.get('values', []))
+            frames[month] = _parse_df(raw, location, year, month)
+
+        return frames
+
     except Exception as e:
-        st.error(f"Error loading {location} {month}: {str(e)}")
-        return pd.DataFrame()
+        st.error(f"Error loading {location}: {str(e)}")
+        return {}
+
+def load_all_locations():
+    """Load every location's data concurrently.
+
+    Each fetch is a network wait, so a thread per location brings total
+    wall time down to the slowest single batchGet. Locations already in
+    the cache return immediately.
+    """
+    # Worker threads need the script run context attached, otherwise the
+    # st.error calls in load_location's failure path are silently dropped
+    ctx = get_script_run_ctx()
+
+    def _load(location):
+        add_script_run_ctx(ctx=ctx)
+        return load_location(location)
+
+    with ThreadPoolExecutor(max_workers=len(LOCATION_KEYS)) as executor:
+        return dict(zip(LOCATION_KEYS, executor.map(_load, LOCATION_KEYS)))
+
+@njit(cache=True)
+def _gb_sum_count(codes, amounts, n_groups):
+    """Grouped sum and count over factorized codes in one sequential pass"""
+    sums = np.zeros(n_groups)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(codes.size):
+        g = codes[i]
+        sums[g] += amounts[i]
+        counts[g] += 1
+    return sums, counts
+
+@st.cache_data(show_spinner=False)
+def compute_dashboard(df):
+    """Compute metrics and both chart aggregates in one cached pass.
+
+    Returns (metrics dict, daily revenue Series, product stats frame) so
+    reruns reuse the groupby results instead of re-aggregating.
+    """
+    empty_metrics = {
+        'total_revenue': 0,
+        'transaction_count': 0,
+        'avg_transaction': 0,
+        'unique_products': 0,
+        'top_product': 'N/A',
+        'daily_average': 0
+    }
 
-def calculate_revenue_metrics(df):
-    """Calculate key revenue metrics"""
     if df.empty:
-        return {
-            'total_revenue': 0,
-            'transaction_count': 0,
-            'avg_transaction': 0,
-            'unique_products': 0,
-            'top_product': 'N/A',
-            'daily_average': 0
-        }
-    
+        return empty_metrics, pd.Series(dtype=float), pd.DataFrame()
+
+    # Product performance - one jitted pass over the category codes
+    # yields sums and counts; means fall out of the division
+    categories = df['Product'].cat.categories
+    sums, counts = _gb_sum_count(
+        df['Product'].cat.codes.to_numpy(),
+        df['Amount'].to_numpy(np.float64),
+        len(categories)
+    )
+    product_stats = pd.DataFrame({
+        'Total Revenue': sums,
+        'Transaction Count': counts,
+        'Avg Value': sums / counts
+    }, index=categories.rename('Product')).round(2)
+    product_stats = product_stats.sort_values('Total Revenue', ascending=False)
+
+    # Daily revenue trend - normalize() keeps the key as datetime64 so
+    # the groupby stays on the fast path instead of boxing date objects
+    daily_revenue = df.groupby(df['DateTime'].dt.normalize())['Amount'].sum().rename_axis('Date')
+
     total_revenue = df['Amount'].sum()
     transaction_count = len(df)
-    avg_transaction = total_revenue / transaction_count if transaction_count > 0 else 0
-    unique_products = df['Product'].nunique()
-    
-    # Top product by revenue
-    product_revenue = df.groupby('Product')['Amount'].sum()
-    top_product = product_revenue.idxmax() if not product_revenue.empty else 'N/A'
-    
-    # Daily average (assuming month has 30 days for simplicity)
-    daily_average = total_revenue / 30
-    
-    return {
+
+    # True number of days in the month, parsed once from the tab name
+    month_start = datetime.strptime(df['Month'].iloc[0], '%b %y')
+    days_in_month = calendar.monthrange(month_start.year, month_start.month)[1]
+
+    metrics = {
         'total_revenue': total_revenue,
         'transaction_count': transaction_count,
-        'avg_transaction': avg_transaction,
-        'unique_products': unique_products,
-        'top_product': top_product,
-        'daily_average': daily_average
+        'avg_transaction': total_revenue / transaction_count if transaction_count > 0 else 0,
+        'unique_products': len(product_stats),
+        'top_product': product_stats.index[0] if not product_stats.empty else 'N/A',
+        'daily_average': total_revenue / days_in_month
     }
 
-def create_revenue_chart(df):
-    """Create daily revenue chart"""
-    if df.empty:
+    return metrics, daily_revenue, product_stats
+
+def create_revenue_chart(daily_revenue):
+    """Create daily revenue chart from the precomputed daily totals"""
+    # Imported here so cold starts and empty-data paths skip plotly's
+    # large module tree
+    import plotly.graph_objects as go
+
+    if daily_revenue.empty:
         return go.Figure()
-    
-    # Group by date
-    daily_revenue = df.groupby(df['DateTime'].dt.date)['Amount'].sum().reset_index()
+
+    daily_revenue = daily_revenue.reset_index()
     daily_revenue.columns = ['Date', 'Revenue']
-    
-    fig = px.line(
-        daily_revenue, 
-        x='Date', 
-        y='Revenue',
-        title='Daily Revenue Trend',
-        markers=True
-    )
-    
+
+    # go.Scattergl skips px's DataFrame-introspection overhead. For long
+    # histories (e.g. Aylesbury 2023-2025) downsample with LTTB so the
+    # browser only receives ~500 points instead of the full series.
+    if len(daily_revenue) > 500:
+        from plotly_resampler import FigureResampler
+
+        fig = FigureResampler(go.Figure(), default_n_shown_samples=500)
+        fig.add_trace(
+            go.Scattergl(mode='lines+markers'),
+            hf_x=daily_revenue['Date'],
+            hf_y=daily_revenue['Revenue']
+        )
+    else:
+        fig = go.Figure(go.Scattergl(
+            x=daily_revenue['Date'],
+            y=daily_revenue['Revenue'],
+            mode='lines+markers'
+        ))
+
     fig.update_layout(
+        title='Daily Revenue Trend',
         xaxis_title="Date",
         yaxis_title="Revenue (£)",
         showlegend=False,
@@ -200,43 +354,77 @@ def create_revenue_chart(df):
     
     return fig
 
-def create_product_analysis(df):
-    """Create product performance analysis"""
-    if df.empty:
-        return go.Figure(), pd.DataFrame()
-    
-    # Product performance
-    product_stats = df.groupby('Product').agg({
-        'Amount': ['sum', 'count', 'mean']
-    }).round(2)
-    
-    product_stats.columns = ['Total Revenue', 'Transaction Count', 'Avg Value']
-    product_stats = product_stats.sort_values('Total Revenue', ascending=False)
-    
-    # Create chart
-    fig = px.bar(
-        product_stats.reset_index(),
-        x='Product',
-        y='Total Revenue',
-        title='Product Performance by Revenue'
-    )
-    
+def create_product_chart(product_stats):
+    """Create product performance chart from the precomputed stats"""
+    import plotly.graph_objects as go
+
+    if product_stats.empty:
+        return go.Figure()
+
+    fig = go.Figure(go.Bar(
+        x=product_stats.index,
+        y=product_stats['Total Revenue']
+    ))
+
     fig.update_layout(
+        title='Product Performance by Revenue',
         xaxis_title="Product",
         yaxis_title="Revenue (£)",
         xaxis_tickangle=-45,
         height=400
     )
-    
-    return fig, product_stats
+
+    return fig
+
+@st.cache_data(show_spinner=False)
+def df_to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes once per unique frame"""
+    return df.to_csv(index=False).encode()
+
+@st.fragment
+def render_analysis(metrics, daily_revenue, product_stats):
+    """Render the charts and insights columns.
+
+    Runs as a fragment with stable chart keys so interactions here only
+    re-execute this section, and Streamlit patches the existing Plotly
+    components (Plotly.react) instead of tearing them down.
+    """
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📈 Daily Revenue Trend")
+        revenue_chart = create_revenue_chart(daily_revenue)
+        st.plotly_chart(revenue_chart, use_container_width=True, key="revenue_chart")
+
+        # Key insights
+        st.subheader("💡 Key Insights")
+        st.write(f"🏆 **Top Product:** {metrics['top_product']}")
+        st.write(f"🛍️ **Product Variety:** {metrics['unique_products']} different products sold")
+
+        # Performance indicators
+        if metrics['total_revenue'] > 6000:
+            st.success("✅ Excellent performance - above £6K target!")
+        elif metrics['total_revenue'] > 4000:
+            st.warning("⚠️ Good performance - approaching target")
+        else:
+            st.error("🔴 Below target - needs attention")
+
+    with col2:
+        st.subheader("🛍️ Product Performance")
+        product_chart = create_product_chart(product_stats)
+        st.plotly_chart(product_chart, use_container_width=True, key="product_chart")
+
+        # Product performance table
+        st.subheader("📊 Product Breakdown")
+        st.dataframe(product_stats, use_container_width=True)
 
 def main():
     st.title("🏢 MyFitPod Franchisor Command Center")
     st.markdown("**Enterprise Franchise Analytics & Performance Monitoring**")
     
-    # Initialize Google Sheets connection
-    gc = init_gspread()
-    if not gc:
+    # Initialize Google API clients
+    sheets, drive = init_services()
+    if not sheets:
         st.error("❌ Could not connect to Google Sheets. Please check your credentials.")
         st.stop()
     
@@ -246,7 +434,7 @@ def main():
     # Location selector
     location = st.sidebar.selectbox(
         "📍 Select Location:",
-        options=list(LOCATIONS.keys()),
+        options=LOCATION_KEYS,
         index=0
     )
     
@@ -265,17 +453,21 @@ def main():
         options=available_months,
         index=len(available_months)-1  # Default to most recent month
     )
-    
-    # Load data
+
+    # Cross-location comparison toggle
+    compare_all = st.sidebar.checkbox("🌍 Compare all locations")
+
+    # Load data (one batched API call per location, then local lookups)
     with st.spinner(f"Loading data for {location} - {month}..."):
-        df = load_sheet_data(gc, location, year, month)
+        frames = load_location(location)
+        df = frames.get(month, pd.DataFrame())
     
     if df.empty:
         st.warning(f"⚠️ No data available for {location} - {month}")
         return
     
-    # Calculate metrics
-    metrics = calculate_revenue_metrics(df)
+    # Compute metrics and chart aggregates in one cached pass
+    metrics, daily_revenue, product_stats = compute_dashboard(df)
     
     # Executive Summary
     st.header(f"📈 {location} Performance - {month}")
@@ -307,41 +499,45 @@ def main():
         )
     
     # Performance Analysis
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("📈 Daily Revenue Trend")
-        revenue_chart = create_revenue_chart(df)
-        st.plotly_chart(revenue_chart, use_container_width=True)
-        
-        # Key insights
-        st.subheader("💡 Key Insights")
-        st.write(f"🏆 **Top Product:** {metrics['top_product']}")
-        st.write(f"🛍️ **Product Variety:** {metrics['unique_products']} different products sold")
-        
-        # Performance indicators
-        if metrics['total_revenue'] > 6000:
-            st.success("✅ Excellent performance - above £6K target!")
-        elif metrics['total_revenue'] > 4000:
-            st.warning("⚠️ Good performance - approaching target")
-        else:
-            st.error("🔴 Below target - needs attention")
-    
-    with col2:
-        st.subheader("🛍️ Product Performance")
-        product_chart, product_stats = create_product_analysis(df)
-        st.plotly_chart(product_chart, use_container_width=True)
-        
-        # Product performance table
-        st.subheader("📊 Product Breakdown")
-        st.dataframe(product_stats, use_container_width=True)
-    
+    render_analysis(metrics, daily_revenue, product_stats)
+
+    # Cross-location comparison (all locations fetched in parallel)
+    if compare_all:
+        st.header(f"🌍 Network Comparison - {month}")
+        with st.spinner("Loading all locations..."):
+            all_frames = load_all_locations()
+
+        totals = {
+            loc: float(loc_frames.get(month, pd.DataFrame()).get('Amount', pd.Series(dtype='float32')).sum())
+            for loc, loc_frames in all_frames.items()
+        }
+        comparison = pd.Series(totals, name='Total Revenue').sort_values(ascending=False)
+
+        import plotly.graph_objects as go
+
+        fig = go.Figure(go.Bar(x=comparison.index, y=comparison.values))
+        fig.update_layout(
+            title=f'Total Revenue by Location - {month}',
+            xaxis_title="Location",
+            yaxis_title="Revenue (£)",
+            height=400
+        )
+        st.plotly_chart(fig, use_container_width=True, key="comparison_chart")
+
+
     # Raw data section (expandable)
     with st.expander("📋 View Raw Transaction Data"):
+        # Data is sorted at load time - reversing the view is O(1)
         st.dataframe(
-            df[['DateTime', 'Product', 'Amount']].sort_values('DateTime', ascending=False),
+            df[['DateTime', 'Product', 'Amount']].iloc[::-1],
             use_container_width=True
         )
+        st.download_button(
+            "⬇️ Download CSV",
+            df_to_csv_bytes(df[['DateTime', 'Product', 'Amount']]),
+            file_name=f"{location}_{month}.csv".replace(" ", "_"),
+            mime="text/csv"
+        )
 
 if __name__ == "__main__":
     main()